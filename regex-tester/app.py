@@ -1,10 +1,320 @@
 
+import asyncio
+import functools
 import re
+from bisect import bisect_left
+from itertools import islice
+from operator import attrgetter
+from typing import NamedTuple
+from rich.text import Span, Text
 from textual.app import App, ComposeResult
 from textual.containers import Vertical
-from textual.widgets import Header, Footer, Input, Label, Markdown, TextArea
+from textual.widgets import Header, Footer, Input, Label, Markdown, Static, TextArea
 from textual.reactive import reactive
 from textual.on import on # Import the 'on' decorator
+from textual.timer import Timer
+
+# Idle time (in seconds) to wait after the last keystroke before re-running the match.
+UPDATE_DEBOUNCE_SECONDS = 0.1
+
+# Upper bounds on the work done per update, so a pathological pattern or huge input can't freeze the UI.
+MAX_MATCHES = 10_000
+MAX_TEST_STRING_LENGTH = 100_000
+
+# Rich style applied to matched text in the highlighted test string.
+MATCH_HIGHLIGHT_STYLE = "bold"
+
+# Widest match (in characters) a pattern may have for its previous matches to be reused when text is appended.
+MAX_RESUMABLE_MATCH_WIDTH = 256
+
+# Translation table that backslash-escapes Markdown special characters.
+_MD_TABLE = str.maketrans({c: "\\" + c for c in "*_`[]()!#-+."})
+
+# An escaped character or a character class, which match literally rather than acting as syntax
+_LITERAL_ATOM = re.compile(r"\\.|\[\^?\]?(?:[^\]\\]|\\.)*\]")
+# An unbounded quantifier: +, * or {n,}
+_UNBOUNDED_QUANTIFIER = re.compile(r"[+*]|\{\d*,\}")
+# The extension prefix of a capturing or non-capturing group, e.g. ?:, ?i: or ?P<name>
+_GROUP_PREFIX = re.compile(r"\?(?:[aiLmsux-]*:|P<\w+>)")
+
+
+def _escape_markup(text: str) -> str:
+    """
+    Escapes text for use in markup. Every [ is escaped, as textual.markup.escape leaves some
+    (e.g. the one in "unknown extension ?<[ at position 1") that Textual still parses as a tag.
+    """
+    return text.replace("[", "\\[")
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_cached(pattern: str) -> re.Pattern[str]:
+    """Compiles a pattern, remembering recent results. Invalid patterns raise and are not cached."""
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=128)
+def _resume_overlap(pattern: str) -> int | None:
+    """
+    Returns how many characters past its start position a match attempt can inspect, or None if
+    that isn't bounded (or is wider than MAX_RESUMABLE_MATCH_WIDTH). Only matches starting at least
+    this far before the end of the old text are unaffected by appending to it.
+    """
+    # Lookaheads can inspect text beyond the match without counting towards its width
+    if "(?=" in pattern or "(?!" in pattern:
+        return None
+    try:
+        # Private CPython module, imported here so the app still works (without resuming) if it moves
+        from re import _parser
+        _, max_width = _parser.parse(pattern).getwidth()
+    except Exception:
+        return None
+    if max_width > MAX_RESUMABLE_MATCH_WIDTH:
+        return None
+    # Allow for assertions such as \b and $ peeking one character past the end of the match
+    return max_width + 1
+
+
+class _MatchCache(NamedTuple):
+    """The matches found for a pattern in a test string, kept so a later scan of longer text can reuse them."""
+
+    pattern: str
+    text: str
+    highlight_spans: tuple[Span, ...]
+    matches_details_md: tuple[str, ...]
+
+
+class _Results(NamedTuple):
+    """What to display for a pattern and test string."""
+
+    # Text for the status label (Rich markup)
+    status: str
+    # The test string with matches highlighted, or None when there is nothing to highlight
+    highlighted_text: Text | None
+    # Markdown for the match details display, or None when showing an error instead
+    details_md: str | None
+    # Error message for the error panel (Rich markup), or None if there was no error
+    error: str | None
+    # Matches to pass back in on the next call, or None when nothing was matched
+    cache: _MatchCache | None
+
+
+def _top_level_branches(body: str) -> list[str]:
+    """Splits a group body on the | alternations that aren't inside a nested group."""
+    branches = []
+    depth = 0
+    branch_start = 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            branches.append(body[branch_start:i])
+            branch_start = i + 1
+    branches.append(body[branch_start:])
+    return branches
+
+
+def _is_single_group(body: str) -> bool:
+    """Whether the text is one group from start to end, e.g. (a+) but not (a)(b)."""
+    if not body.startswith("("):
+        return False
+    depth = 0
+    for i, char in enumerate(body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return i == len(body) - 1
+    return False
+
+
+@functools.lru_cache(maxsize=128)
+def _looks_superlinear(pattern: str) -> bool:
+    """
+    Heuristically detects patterns prone to catastrophic backtracking: an unbounded repetition of
+    a group that can match the same text in many ways. That is a group whose body starts with an
+    unboundedly repeated atom and ends in a quantifier, e.g. (a+)+, (.*)* or (a+b?)+, or whose
+    alternatives repeat one another, e.g. (a|a)* or (a|aa)+.
+    """
+    # Replace escapes and character classes with one placeholder character per distinct atom,
+    # so the [+*] in ([+*/-])+ isn't mistaken for a quantifier
+    atoms: dict[str, str] = {}
+    simplified = _LITERAL_ATOM.sub(lambda m: atoms.setdefault(m.group(), chr(0xE000 + len(atoms))), pattern)
+
+    open_groups = []
+    for i, char in enumerate(simplified):
+        if char == "(":
+            open_groups.append(i)
+        elif char == ")" and open_groups:
+            group_start = open_groups.pop()
+            if not _UNBOUNDED_QUANTIFIER.match(simplified, i + 1):
+                continue
+            body = simplified[group_start + 1:i]
+            # Look through groups that only wrap another group, e.g. ((a+))+
+            while True:
+                prefix = _GROUP_PREFIX.match(body)
+                if prefix:
+                    body = body[prefix.end():]
+                if not _is_single_group(body):
+                    break
+                body = body[1:-1]
+            # Atomic groups never backtrack into their body, which is what makes them safe
+            if body.startswith("?>"):
+                continue
+            if _UNBOUNDED_QUANTIFIER.match(body, 1) and body[-1:] in ("+", "*", "?", "}"):
+                return True
+            branches = _top_level_branches(body)
+            for j, branch in enumerate(branches):
+                for other in branches[j + 1:]:
+                    shorter, longer = sorted((branch, other), key=len)
+                    if shorter and longer == shorter * (len(longer) // len(shorter)):
+                        return True
+    return False
+
+
+def _compute_results(
+    pattern: str, current_test_str: str, cache: _MatchCache | None = None
+) -> _Results:
+    """
+    Compiles the regex pattern and finds its matches in the test string.
+    Touches no widgets, so it can run in a worker thread.
+    """
+    try:
+        compiled_regex = _compile_cached(pattern)
+    except re.error as e:
+        return _Results(
+            f"Regex Status: [b red]Invalid[/] - {_escape_markup(str(e))}",
+            None,
+            None,
+            f"[red]Regex Error[/red]: {_escape_markup(str(e))}",
+            None,
+        )
+    except Exception as e: # Catch other potential errors during compile
+        return _Results(
+            f"Regex Status: [b red]Error[/] - Unexpected: {_escape_markup(str(e))}",
+            None,
+            None,
+            f"[red]Unexpected Compilation Error[/red]: {_escape_markup(str(e))}",
+            None,
+        )
+
+    # A single match attempt runs in _sre without releasing the GIL, so a runaway one would freeze
+    # the UI even in a worker thread, and couldn't be stopped. Don't run patterns that look exponential.
+    if _looks_superlinear(pattern):
+        return _Results(
+            "Regex Status: [b yellow]Valid (⚠ potentially exponential)[/]",
+            None,
+            "### Matching Skipped\n\nThis pattern repeats a group that can match the same text in many ways, so it may backtrack catastrophically.",
+            None,
+            None,
+        )
+
+    # Using markup tags for status, e.g., "[b green]Valid[/]"
+    status_text = "Regex Status: [b green]Valid[/]"
+
+    if not current_test_str:
+        return _Results(status_text, None, "Enter a test string to find matches.", None, None)
+
+    notices = []
+    if len(current_test_str) > MAX_TEST_STRING_LENGTH:
+        current_test_str = current_test_str[:MAX_TEST_STRING_LENGTH]
+        notices.append(f"*(Test string truncated to the first {MAX_TEST_STRING_LENGTH} characters)*")
+
+    # A string of length n has at most 2n + 1 matches (an empty and a non-empty match per position,
+    # plus an empty match at the end), so size the result lists up front instead of growing them.
+    capacity = min(MAX_MATCHES, 2 * len(current_test_str) + 1)
+    matches_details_md: list[str | None] = [None] * capacity
+    # Matches are highlighted with style spans over the raw text, so no Markdown escaping is needed there
+    highlight_spans: list[Span | None] = [None] * capacity
+    match_count = 0
+    scan_pos = 0
+
+    # When the test string has only been appended to, matches starting far enough before the old end
+    # can't have changed, so carry those over and resume scanning after them.
+    if cache is not None and cache.pattern == pattern and current_test_str.startswith(cache.text):
+        overlap = _resume_overlap(pattern)
+        if overlap is not None:
+            cached_spans = cache.highlight_spans
+            match_count = bisect_left(cached_spans, len(cache.text) - overlap, key=attrgetter("start"))
+            if match_count:
+                last_span = cached_spans[match_count - 1]
+                if last_span.start == last_span.end:
+                    # Resuming right after an empty match would find it again, so rescan from it instead
+                    match_count -= 1
+                    scan_pos = last_span.start
+                else:
+                    scan_pos = last_span.end
+            highlight_spans[:match_count] = cached_spans[:match_count]
+            matches_details_md[:match_count] = cache.matches_details_md[:match_count]
+
+    # Bind globals and methods used per match to locals, which are faster to look up in the loop
+    md_table = _MD_TABLE
+    translate = str.translate
+    make_span = Span
+    highlight_style = MATCH_HIGHLIGHT_STYLE
+    # Whether matches have any groups is a property of the pattern, so check it once
+    has_groups = compiled_regex.groups > 0
+    has_named_groups = bool(compiled_regex.groupindex)
+
+    try:
+        match_iter = compiled_regex.finditer(current_test_str, scan_pos)
+        for match_obj in islice(match_iter, capacity - match_count):
+            # Slicing the string is cheaper than span() (a tuple) plus group(0) (a group lookup)
+            start = match_obj.start()
+            end = match_obj.end()
+            matched_text_segment = current_test_str[start:end]
+
+            highlight_spans[match_count] = make_span(start, end, highlight_style)
+
+            # Prepare details for each match
+            esc_match = translate(matched_text_segment, md_table)
+            match_info_parts = [f"- **Match**: `{esc_match}` (span=({start}, {end}))"]
+
+            if has_groups:
+                groups = match_obj.groups() # Returns a tuple of all groups
+                group_str_parts = []
+                for i, g in enumerate(groups):
+                    escaped_g = translate(g, md_table) if g is not None else "None"
+                    group_str_parts.append(f"`{escaped_g}`")
+                match_info_parts.append(f"\n  - Groups ({len(groups)}): ({', '.join(group_str_parts)})")
+
+            if has_named_groups:
+                named_group_parts = []
+                for name, val in match_obj.groupdict().items(): # Returns a dict of named groups
+                    escaped_val = translate(val, md_table) if val is not None else "None"
+                    named_group_parts.append(f"{name}=`{escaped_val}`")
+                match_info_parts.append(f"\n  - Named Groups: {{{', '.join(named_group_parts)}}}")
+            matches_details_md[match_count] = "".join(match_info_parts)
+            match_count += 1
+        del matches_details_md[match_count:]
+        del highlight_spans[match_count:]
+
+        # islice stops at the cap without consuming further, so any remaining match means we truncated
+        if next(match_iter, None) is not None:
+            notices.append(f"*(Truncated at {MAX_MATCHES} matches)*")
+
+    except Exception as e: # Catch errors during finditer or processing
+        return _Results(
+            f"Regex Status: [b red]Error during matching[/] - {_escape_markup(str(e))}",
+            None,
+            None,
+            f"[red]Matching Error[/red]: {_escape_markup(str(e))}",
+            None,
+        )
+
+    new_cache = _MatchCache(pattern, current_test_str, tuple(highlight_spans), tuple(matches_details_md))
+    highlighted_text = Text(current_test_str, spans=highlight_spans)
+
+    if matches_details_md:
+        parts = ["### Match Details:\n\n", "\n\n".join(matches_details_md)]
+        for notice in notices:
+            parts.append("\n\n")
+            parts.append(notice)
+        return _Results(status_text, highlighted_text, "".join(parts), None, new_cache)
+    return _Results(status_text, highlighted_text, "\n\n".join(["No matches found.", *notices]), None, new_cache)
+
 
 class RegexTesterApp(App[None]):
     """A Textual app for testing regular expressions."""
@@ -54,6 +364,24 @@ class RegexTesterApp(App[None]):
         margin-top: 1; /* Space above results */
     }
 
+    Static#highlighted_text {
+        display: none; /* Shown once there is a test string to highlight */
+        height: auto;
+        border: round $secondary;
+        padding: 0 1;
+        margin-bottom: 1;
+        background: $panel;
+    }
+
+    Static#error_panel {
+        display: none; /* Shown in place of the match details when there is an error */
+        height: auto;
+        min-height: 8;
+        border: round $error;
+        padding: 0 1;
+        background: $panel;
+    }
+
     Markdown#match_results {
         height: auto;
         min-height: 8; /* Minimum height for the results display */
@@ -67,6 +395,24 @@ class RegexTesterApp(App[None]):
     regex_pattern: reactive[str] = reactive("")
     test_string: reactive[str] = reactive("")
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending_timer: Timer | None = None
+        # The (pattern, test string) pair most recently shown in the results, if any.
+        self._last_inputs: tuple[str, str] | None = None
+        # Matches from the last scan, reused when the test string is only appended to.
+        self._match_cache: _MatchCache | None = None
+        # What the status label and results display currently show.
+        self._last_status: str = ""
+        self._last_highlight: Text | None = None
+        self._last_markdown: str = ""
+        self._last_error: str | None = None
+        # Handles to the output widgets, assigned in on_mount once they exist.
+        self._status: Label
+        self._highlight: Static
+        self._results: Markdown
+        self._error_panel: Static
+
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
         yield Header()
@@ -88,11 +434,18 @@ class RegexTesterApp(App[None]):
 
             with Vertical(id="results_area"):
                 yield Label("Match Results:")
+                yield Static(id="highlighted_text", markup=False)
                 yield Markdown("", id="match_results")
+                yield Static(id="error_panel")
         yield Footer()
 
     def on_mount(self) -> None:
         """Called when the app is first mounted. Focus the regex input."""
+        # Keep handles to the output widgets so updates don't have to query the DOM each time
+        self._status = self.query_one("#regex_status", Label)
+        self._highlight = self.query_one("#highlighted_text", Static)
+        self._results = self.query_one("#match_results", Markdown)
+        self._error_panel = self.query_one("#error_panel", Static)
         self.query_one("#regex_pattern_input", Input).focus()
 
     # Event handlers using the 'on' decorator for more targeted handling
@@ -111,110 +464,74 @@ class RegexTesterApp(App[None]):
     async def watch_regex_pattern(self, old_pattern: str, new_pattern: str) -> None:
         """Called when self.regex_pattern changes."""
         if old_pattern != new_pattern:
-            await self._update_matches()
+            self._schedule_update()
 
     async def watch_test_string(self, old_string: str, new_string: str) -> None:
         """Called when self.test_string changes."""
         if old_string != new_string:
-            await self._update_matches()
+            self._schedule_update()
 
-    async def _update_matches(self) -> None:
+    def _schedule_update(self) -> None:
         """
-        Compiles the current regex pattern and finds matches in the current test string.
-        Updates the status label and the match results Markdown display.
+        Schedules a match update once input has been idle for UPDATE_DEBOUNCE_SECONDS.
+        Each call restarts the wait, so a burst of keystrokes results in a single update.
         """
-        status_label = self.query_one("#regex_status", Label)
-        results_markdown = self.query_one("#match_results", Markdown)
+        if self._pending_timer is not None:
+            self._pending_timer.stop()
+        self._pending_timer = self.set_timer(UPDATE_DEBOUNCE_SECONDS, self._run_update)
+
+    def _run_update(self) -> None:
+        """Starts a match update as an exclusive worker, cancelling one that is still in flight."""
+        self._pending_timer = None
+        self.run_worker(self._update_matches(), group="update_matches", exclusive=True)
 
+    async def _update_matches(self) -> None:
+        """
+        Matches the current regex pattern against the current test string in a worker thread.
+        The thread hands the GIL back between finditer steps, so scans yielding many matches
+        and building the results don't block the event loop. A single slow match attempt
+        still does, because _sre keeps the GIL for the whole attempt.
+        Updates the status label, the highlighted test string, and either the match details
+        Markdown display or, if there is an error, the error panel.
+        """
         pattern = self.regex_pattern
         current_test_str = self.test_string
 
-        if not pattern:
-            status_label.update("Regex Status: (Enter a pattern)")
-            await results_markdown.update("Enter a regex pattern to see matches.")
-            return
-
-        try:
-            compiled_regex = re.compile(pattern)
-            # Using Rich tags for status, e.g., "[b green]Valid[/b]"
-            status_label.update("Regex Status: [b green]Valid[/b]")
-        except re.error as e:
-            status_label.update(f"Regex Status: [b red]Invalid[/b] - {e}")
-            await results_markdown.update(f"### Regex Error\n\n```\n{e}\n```")
-            return
-        except Exception as e: # Catch other potential errors during compile
-            status_label.update(f"Regex Status: [b red]Error[/b] - Unexpected: {e}")
-            await results_markdown.update(f"### Unexpected Compilation Error\n\n```\n{e}\n```")
-            return
-
-        if not current_test_str:
-            await results_markdown.update("Enter a test string to find matches.")
-            return
-
-        matches_details_md = []
-        highlighted_text_parts_for_md = []
-        last_char_index = 0
-
-        try:
-            for match_obj in compiled_regex.finditer(current_test_str):
-                start, end = match_obj.span()
-                matched_text_segment = match_obj.group(0)
-
-                # Prepare for highlighted output: escape Markdown in non-matched parts
-                non_match_part = current_test_str[last_char_index:start]
-                # Basic escaping for Markdown special characters
-                escaped_non_match = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", non_match_part)
-                highlighted_text_parts_for_md.append(escaped_non_match)
-
-                # Bold the matched part (escape special chars inside match if needed, then bold)
-                escaped_match_segment = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", matched_text_segment)
-                highlighted_text_parts_for_md.append(f"**{escaped_match_segment}**")
-                last_char_index = end
-
-                # Prepare details for each match
-                match_info = f"- **Match**: `{escaped_match_segment}` (span=({start}, {end}))" # Use escaped version
-
-                groups = match_obj.groups() # Returns a tuple of all groups
-                if groups:
-                    group_str_parts = []
-                    for i, g in enumerate(groups):
-                        escaped_g = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", g) if g is not None else "None"
-                        group_str_parts.append(f"`{escaped_g}`")
-                    match_info += f"\n  - Groups ({len(groups)}): ({', '.join(group_str_parts)})"
-
-                groupdict = match_obj.groupdict() # Returns a dict of named groups
-                if groupdict:
-                    named_group_parts = []
-                    for name, val in groupdict.items():
-                        escaped_val = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", val) if val is not None else "None"
-                        named_group_parts.append(f"{name}=`{escaped_val}`")
-                    match_info += f"\n  - Named Groups: {{{', '.join(named_group_parts)}}}"
-                matches_details_md.append(match_info)
-
-            # Append the rest of the string after the last match
-            final_non_match_part = current_test_str[last_char_index:]
-            escaped_final_non_match = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", final_non_match_part)
-            highlighted_text_parts_for_md.append(escaped_final_non_match)
-
-            highlighted_output_for_markdown = "".join(highlighted_text_parts_for_md)
-
-        except Exception as e: # Catch errors during finditer or processing
-            status_label.update(f"Regex Status: [b red]Error during matching[/b] - {e}")
-            await results_markdown.update(f"### Matching Error\n\n```\n{e}\n```")
+        # Edits that cancel out (e.g. typing then deleting a character) leave nothing to do.
+        key = (pattern, current_test_str)
+        if key == self._last_inputs:
             return
 
-        if matches_details_md:
-            results_content = "### Highlighted Text:\n\n"
-            results_content += highlighted_output_for_markdown if highlighted_output_for_markdown else "(No visual text to highlight if all is matched or empty)"
-            results_content += "\n\n### Match Details:\n\n" + "\n\n".join(matches_details_md)
-            await results_markdown.update(results_content)
+        if not pattern:
+            results = _Results(
+                "Regex Status: (Enter a pattern)", None, "Enter a regex pattern to see matches.", None, None
+            )
         else:
-            # If the string is not empty but no matches, show the original string (escaped)
-            if current_test_str:
-                escaped_current_test_str = re.sub(r"([*_`\[\]\(\)!#\-\+\.])", r"\\\1", current_test_str)
-                await results_markdown.update(f"No matches found in:\n\n{escaped_current_test_str}")
-            else:
-                await results_markdown.update("No matches found.")
+            results = await asyncio.to_thread(_compute_results, pattern, current_test_str, self._match_cache)
+            self._match_cache = results.cache
+
+        # If this update is cancelled part way through, the widgets show a mix of old and new inputs,
+        # so forget the last pair until every widget is up to date again.
+        self._last_inputs = None
+
+        # Re-rendering is costly (especially Markdown), so only update widgets whose content changed
+        if results.status != self._last_status:
+            self._status.update(results.status)
+            self._last_status = results.status
+        if results.highlighted_text != self._last_highlight:
+            self._highlight.display = results.highlighted_text is not None
+            self._highlight.update(results.highlighted_text or "")
+            self._last_highlight = results.highlighted_text
+        if results.error != self._last_error:
+            # Errors are short, so show them with Rich markup rather than paying for a Markdown parse
+            self._error_panel.display = results.error is not None
+            self._results.display = results.error is None
+            self._error_panel.update(results.error or "")
+            self._last_error = results.error
+        if results.details_md is not None and results.details_md != self._last_markdown:
+            await self._results.update(results.details_md)
+            self._last_markdown = results.details_md
+        self._last_inputs = key
 
 def main_cli():
     """Entry point function for the CLI."""